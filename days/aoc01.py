@@ -3,12 +3,19 @@ import numpy as np
 fmt_dict = {"cast": int}
 
 
+def total_fuel(masses, chunk_size=1 << 20):
+    # masses may be any int array, including an np.memmap; it is read in chunks
+    total = 0
+    for start in range(0, len(masses), chunk_size):
+        fuel = np.asarray(masses[start : start + chunk_size], dtype=np.int64)
+        while (fuel := fuel // 3 - 2).size:
+            fuel = fuel[fuel > 0]
+            total += int(fuel.sum())
+    return total
+
+
 def solve(data):
     arr = np.array(data)
     ans1 = np.sum(arr // 3) - 2 * arr.size
-    ans2 = 0
-    for n in arr:
-        while n > 8:
-            n = n // 3 - 2
-            ans2 += n
+    ans2 = total_fuel(arr)
     return ans1, ans2
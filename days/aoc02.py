@@ -1,32 +1,121 @@
 from util import ints
+import numpy as np
 
 fmt_dict = {"sep": None}
 
 
 def simulate(arr, noun=12, verb=2):
-    arr = list(arr)
-    arr[1], arr[2] = noun, verb
+    # nouns and verbs may be arrays; every instance runs in lockstep as one row
+    nouns, verbs = np.broadcast_arrays(noun, verb)
+    # a single run keeps exact Python ints, as int64 would silently wrap
+    dtype = object if nouns.size == 1 else np.int64
+    arr = np.tile(np.array(arr, dtype=dtype), (nouns.size, 1))
+    arr[:, 1], arr[:, 2] = nouns.ravel(), verbs.ravel()
+    rows = np.arange(len(arr))
+    failed = np.zeros(len(arr), dtype=bool)
     i = 0
-    n = len(arr)
+    n = arr.shape[1]
+    while i < n and rows.size:
+        ops = arr[rows, i]
+        running = (ops == 1) | (ops == 2)
+        rows, ops = rows[running], ops[running]
+        if i + 3 >= n:
+            failed[rows] = True
+            break
+        # a row addressing outside the program fails alone, not the batch
+        params = arr[rows, i + 1 : i + 4]
+        valid = ((params >= -n) & (params < n)).all(axis=1)
+        failed[rows[~valid]] = True
+        rows, ops, params = rows[valid], ops[valid], params[valid]
+        a, b, c = params.T.astype(np.int64)
+        x, y = arr[rows, a], arr[rows, b]
+        arr[rows, c] = np.where(ops == 1, x + y, x * y)
+        i += 4
+    result = arr[:, 0].reshape(nouns.shape)
+    failed = failed.reshape(nouns.shape)
+    if result.ndim == 0:
+        if failed:
+            raise IndexError("program addresses past its end")
+        return int(result)
+    return np.ma.masked_array(result, failed)
+
+
+# polynomials in the noun and verb map (noun power, verb power) to coefficients
+def poly_add(x, y):
+    z = dict(x)
+    for k, c in y.items():
+        z[k] = z.get(k, 0) + c
+    return {k: c for k, c in z.items() if c}
+
+
+def poly_mul(x, y):
+    z = {}
+    for (p1, q1), c1 in x.items():
+        for (p2, q2), c2 in y.items():
+            k = (p1 + p2, q1 + q2)
+            z[k] = z.get(k, 0) + c1 * c2
+    return {k: c for k, c in z.items() if c}
+
+
+def constant(poly):
+    if poly is None or poly.keys() - {(0, 0)}:
+        return None
+    return poly.get((0, 0), 0)
+
+
+def symbolic_simulate(arr):
+    # cells read through a noun or verb dependent address become unknown
+    # (None); returns None if the control flow or arr[0] ends up unknown
+    cells = [{(0, 0): v} if v else {} for v in arr]
+    cells[1], cells[2] = {(1, 0): 1}, {(0, 1): 1}
+    i = 0
+    n = len(cells)
     while i < n:
-        match arr[i]:
-            case 1:
-                a, b, c = arr[i + 1 : i + 4]
-                arr[c] = arr[a] + arr[b]
-            case 2:
-                a, b, c = arr[i + 1 : i + 4]
-                arr[c] = arr[a] * arr[b]
-            case _:
-                break
+        op = constant(cells[i])
+        if op is None:
+            return None
+        if op != 1 and op != 2:
+            break
+        a, b, c = (constant(cell) for cell in cells[i + 1 : i + 4])
+        if c is None or not 0 <= c < n:
+            return None
+        if a is None or b is None or not (0 <= a < n and 0 <= b < n):
+            cells[c] = None
+        elif cells[a] is None or cells[b] is None:
+            cells[c] = None
+        else:
+            cells[c] = (poly_add if op == 1 else poly_mul)(cells[a], cells[b])
         i += 4
-    return arr[0]
+    return cells[0]
+
+
+def find_inputs(arr, target, n=100):
+    poly = symbolic_simulate(arr)
+    if poly is not None and all(p + q <= 1 for p, q in poly):
+        c, a, b = (poly.get(k, 0) for k in ((0, 0), (1, 0), (0, 1)))
+        for i in range(n):
+            rest = target - c - a * i
+            if b == 0:
+                if rest == 0:
+                    return i, 0
+            elif rest % b == 0 and 0 <= rest // b < n:
+                return i, rest // b
+        return None
+    nouns, verbs = np.meshgrid(np.arange(n), np.arange(n), indexing="ij")
+    if poly is None:
+        values = simulate(arr, nouns, verbs)
+    else:
+        values = np.zeros((n, n), dtype=np.int64)
+        for (p, q), c in poly.items():
+            values += c * nouns**p * verbs**q
+    hits = np.argwhere(np.ma.filled(values == target, False))
+    return tuple(hits[0].tolist()) if len(hits) else None
 
 
 def solve(data):
     arr = ints(data)
     ans1 = simulate(arr)
-    for i in range(100):
-        for j in range(100):
-            if simulate(arr, i, j) == 19690720:
-                return ans1, 100 * i + j
+    match find_inputs(arr, 19690720):
+        case (noun, verb):
+            return ans1, 100 * noun + verb
     return ans1, None
@@ -1,61 +1,140 @@
-from collections import Counter
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 
+NEIGHBORHOOD = ((0, 0), (-1, 0), (1, 0), (0, -1), (0, 1))
 
-def wire_positions(wire):
-    positions = {}
+
+def wire_segments(wire):
+    # (horizontal, fixed coordinate, lo, hi, start, direction, start steps)
+    segments = []
     i, j, d = 0, 0, 0
     for instr in wire:
         steps = int(instr[1:])
         match instr[0]:
             case "L":
-                for _ in range(steps):
-                    j -= 1
-                    d += 1
-                    if (i, j) not in positions:
-                        positions[i, j] = d
+                segments.append((True, i, j - steps, j, j, -1, d))
+                j -= steps
             case "R":
-                for _ in range(steps):
-                    j += 1
-                    d += 1
-                    if (i, j) not in positions:
-                        positions[i, j] = d
+                segments.append((True, i, j, j + steps, j, 1, d))
+                j += steps
             case "U":
-                for _ in range(steps):
-                    i -= 1
-                    d += 1
-                    if (i, j) not in positions:
-                        positions[i, j] = d
+                segments.append((False, j, i - steps, i, i, -1, d))
+                i -= steps
             case "D":
-                for _ in range(steps):
-                    i += 1
-                    d += 1
-                    if (i, j) not in positions:
-                        positions[i, j] = d
-    return positions
+                segments.append((False, j, i, i + steps, i, 1, d))
+                i += steps
+        d += steps
+    return segments
+
+
+def segment_steps(segment, c):
+    _, _, _, _, start, direction, d = segment
+    return d + (c - start) * direction
+
+
+def segment_point(segment, c):
+    horizontal, fixed = segment[:2]
+    return (fixed, c) if horizontal else (c, fixed)
+
+
+class SegmentIndex:
+    def __init__(self, segments):
+        self.__lines = {True: defaultdict(list), False: defaultdict(list)}
+        for segment in segments:
+            self.__lines[segment[0]][segment[1]].append(segment)
+        self.__fixed = {h: sorted(lines) for h, lines in self.__lines.items()}
+
+    def crossings(self, segment):
+        horizontal, fixed, lo, hi = segment[:4]
+        lines = self.__lines[not horizontal]
+        keys = self.__fixed[not horizontal]
+        for c in keys[bisect_left(keys, lo) : bisect_right(keys, hi)]:
+            for other in lines[c]:
+                if other[2] <= fixed <= other[3]:
+                    yield segment_point(segment, c)
+
+    def overlaps(self, segment):
+        horizontal, fixed, lo, hi = segment[:4]
+        for other in self.__lines[horizontal].get(fixed, ()):
+            low, high = max(lo, other[2]), min(hi, other[3])
+            if low <= high:
+                yield low, high
+
+    def steps(self, point):
+        # fewest steps to first reach point, or None if the wire never does
+        i, j = point
+        best = None
+        for horizontal, fixed, c in ((True, i, j), (False, j, i)):
+            for segment in self.__lines[horizontal].get(fixed, ()):
+                if segment[2] <= c <= segment[3]:
+                    steps = segment_steps(segment, c)
+                    if steps and (best is None or steps < best):
+                        best = steps
+        return best
+
+
+class WireCrossings:
+    def __init__(self):
+        self.__wires = []
+        self.__ends = defaultdict(set)
+        self.__visits = {}
+
+    def add(self, wire):
+        # wire may be any iterable of moves; it is read once into segments
+        segments = wire_segments(wire)
+        index = SegmentIndex(segments)
+        n = len(self.__wires)
+        for point, visits in self.__visits.items():
+            if (steps := index.steps(point)) is not None:
+                visits[n] = steps
+        for segment in segments:
+            self.__ends[segment[:2]].update(segment[2:4])
+        points = set()
+        for segment in segments:
+            lo, hi = segment[2:4]
+            # step sums and distances to the origin are linear between the
+            # segment ends and crossings on a line, so along a shared stretch
+            # only those, the origin and their neighbours can be best
+            marks = {
+                c + dc for c in self.__ends[segment[:2]] | {0} for dc in (-1, 0, 1)
+            }
+            for other in self.__wires:
+                for i, j in other.crossings(segment):
+                    points.update((i + di, j + dj) for di, dj in NEIGHBORHOOD)
+                for low, high in other.overlaps(segment):
+                    points.update(
+                        segment_point(segment, c) for c in marks if low <= c <= high
+                    )
+            # the new ends also split stretches shared by earlier wires
+            for c in (lo - 1, lo, lo + 1, hi - 1, hi, hi + 1):
+                points.add(segment_point(segment, c))
+        self.__wires.append(index)
+        for point in points - self.__visits.keys():
+            visits = {
+                m: steps
+                for m, other in enumerate(self.__wires)
+                if (steps := other.steps(point)) is not None
+            }
+            if len(visits) > 1:
+                self.__visits[point] = visits
+        return n
+
+    def crossings(self, k=2):
+        # maps each point reached by at least k wires to the steps each takes
+        return {p: v for p, v in self.__visits.items() if len(v) >= k}
+
+    def nearest(self, k=2):
+        return min((abs(i) + abs(j) for i, j in self.crossings(k)), default=None)
+
+    def fewest_steps(self, k=2):
+        return min(
+            (sum(visits.values()) for visits in self.crossings(k).values()),
+            default=None,
+        )
 
 
 def solve(data):
-    wires = [w.split(",") for w in data]
-    overlaps = Counter()
-    steps = Counter()
-
-    for wire in wires:
-        p = wire_positions(wire)
-        overlaps.update(p.keys())
-        steps.update(p)
-
-    min_manhattan = None
-    min_steps = None
-    for (i, j), wire_count in overlaps.items():
-        if wire_count < 2:
-            continue
-
-        dist_manhattan = abs(i) + abs(j)
-        if min_manhattan is None or dist_manhattan < min_manhattan:
-            min_manhattan = dist_manhattan
-
-        dist_steps = steps[i, j]
-        if min_steps is None or dist_steps < min_steps:
-            min_steps = dist_steps
-
-    return min_manhattan, min_steps
+    wires = WireCrossings()
+    for w in data:
+        wires.add(w.split(","))
+    return wires.nearest(), wires.fewest_steps()
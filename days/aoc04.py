@@ -1,33 +1,83 @@
+from functools import cache
+import numpy as np
+
 fmt_dict = {"sep": None}
 
 
-def is_valid(n, span_func):
-    n = str(n)
-    if len(n) != 6:
-        return False
-    span = 1
-    spans = set()
-    for a, b in zip(n, n[1:]):
-        if a > b:
-            return False
-        elif a == b:
-            span += 1
-        else:
-            spans.add(span)
-            span = 1
-    spans.add(span)
-    spans.discard(1)
-    return span_func(spans)
+def digit_matrix(n, digits=6):
+    n = np.asarray(n, dtype=np.int64)
+    matrix = np.empty(n.shape + (digits,), dtype=np.int64)
+    for k in range(digits - 1, -1, -1):
+        n, matrix[..., k] = np.divmod(n, 10)
+    return matrix
+
+
+def non_decreasing(matrix):
+    return (np.diff(matrix, axis=-1) >= 0).all(axis=-1)
+
+
+def has_pair(matrix):
+    return (np.diff(matrix, axis=-1) == 0).any(axis=-1)
+
+
+def has_exact_pair(matrix):
+    # an equal adjacent pair whose neighbouring pairs are both unequal
+    same = np.diff(matrix, axis=-1) == 0
+    padded = np.pad(same, [(0, 0)] * (same.ndim - 1) + [(1, 1)])
+    return (same & ~padded[..., :-2] & ~padded[..., 2:]).any(axis=-1)
+
+
+PART_1 = (non_decreasing, has_pair)
+PART_2 = (non_decreasing, has_exact_pair)
+
+
+def is_valid(n, rules=PART_1, digits=6):
+    # each rule maps a (..., digits) digit matrix to a boolean mask
+    n = np.asarray(n, dtype=np.int64)
+    mask = (10 ** (digits - 1) <= n) & (n < 10**digits)
+    matrix = digit_matrix(n, digits)
+    for rule in rules:
+        mask &= rule(matrix)
+    return mask
+
+
+def valid_passwords(a, b, rules=PART_1, digits=6):
+    candidates = np.arange(a, b + 1, dtype=np.int64)
+    return candidates[is_valid(candidates, rules, digits)]
+
+
+def count_up_to(n, digits=6):
+    # (part 1, part 2) counts of valid passwords of the given length up to n
+    n = min(n, 10**digits - 1)
+    if n < 10 ** (digits - 1):
+        return 0, 0
+    bound = [int(c) for c in str(n)]
+
+    @cache
+    def count(pos, last, run, pair, exact, tight):
+        # run is the length of the current run of equal digits, capped at 3
+        if pos == digits:
+            return int(pair or run >= 2), int(exact or run == 2)
+        part1 = part2 = 0
+        for d in range(last, (bound[pos] if tight else 9) + 1):
+            if d == last:
+                state = min(run + 1, 3), pair, exact
+            else:
+                state = 1, pair or run >= 2, exact or run == 2
+            n1, n2 = count(pos + 1, d, *state, tight and d == bound[pos])
+            part1 += n1
+            part2 += n2
+        return part1, part2
+
+    # starting from 1 keeps digits non-decreasing without a leading zero
+    return count(0, 1, 0, False, False, True)
+
+
+def count_valid(a, b, digits=6):
+    hi, lo = count_up_to(b, digits), count_up_to(a - 1, digits)
+    return hi[0] - lo[0], hi[1] - lo[1]
 
 
 def solve(data):
     a, b = map(int, data.split("-"))
-    valid_passwords = set()
-    valid_passwords_2 = set()
-    for n in range(a, b + 1):
-        if is_valid(n, lambda spans: 2 in spans):
-            valid_passwords_2.add(n)
-            valid_passwords.add(n)
-        elif is_valid(n, lambda spans: spans):
-            valid_passwords.add(n)
-    return len(valid_passwords), len(valid_passwords_2)
+    return count_valid(a, b)
@@ -1,34 +1,84 @@
-from collections import defaultdict, deque
+import numpy as np
+
+
+class OrbitMap:
+    def __init__(self, lines):
+        ids = {}
+        edges = []
+        for line in lines:
+            orbitee, orbiter = line.split(")")
+            for name in (orbitee, orbiter):
+                ids.setdefault(name, len(ids))
+            edges.append((ids[orbitee], ids[orbiter]))
+        n = len(ids)
+        # roots are their own parent
+        parent = np.arange(n)
+        if edges:
+            orbitees, orbiters = np.array(edges).T
+            parent[orbiters] = orbitees
+        # pointer jumping: up[k] holds each object's 2**k-th ancestor, and the
+        # distances covered by the jumps add up to the depths
+        depth = (parent != np.arange(n)).astype(np.int64)
+        up = [parent]
+        while np.any(up[-1] != up[-1][up[-1]]):
+            depth += depth[up[-1]]
+            up.append(up[-1][up[-1]])
+        self.__ids = ids
+        self.__names = list(ids)
+        self.__parent = parent
+        self.__depth = depth
+        self.__up = up
+
+    def id(self, name):
+        return self.__ids[name]
+
+    def parent(self, name):
+        i = self.__ids[name]
+        p = self.__parent[i]
+        return None if p == i else self.__names[p]
+
+    def depth(self, name):
+        return int(self.__depth[self.__ids[name]])
+
+    def total_orbits(self):
+        return int(self.__depth.sum())
+
+    def ancestor(self, nodes, steps):
+        for k, up in enumerate(self.__up):
+            nodes = np.where((steps >> k) & 1, up[nodes], nodes)
+        return nodes
+
+    def lca(self, a, b):
+        # ids of the lowest common ancestors, or -1 where there is none
+        depth = self.__depth
+        a, b = np.asarray(a), np.asarray(b)
+        deeper = depth[a] >= depth[b]
+        a, b = np.where(deeper, a, b), np.where(deeper, b, a)
+        a = self.ancestor(a, depth[a] - depth[b])
+        for up in reversed(self.__up):
+            move = up[a] != up[b]
+            a, b = np.where(move, up[a], a), np.where(move, up[b], b)
+        parent = self.__parent
+        a, b = np.where(a == b, a, parent[a]), np.where(a == b, b, parent[b])
+        return np.where(a == b, a, -1)
+
+    def distances(self, pairs):
+        # transfers between each pair of objects, or -1 if they are not connected
+        pairs = [(self.__ids[a], self.__ids[b]) for a, b in pairs]
+        a, b = np.array(pairs, dtype=np.int64).reshape(-1, 2).T
+        common = self.lca(a, b)
+        depth = self.__depth
+        return np.where(common < 0, -1, depth[a] + depth[b] - 2 * depth[common])
+
+    def distance(self, a, b):
+        d = int(self.distances([(a, b)])[0])
+        return None if d < 0 else d
+
+    def transfers(self, a, b):
+        # orbital transfers to move from the object a orbits to the one b orbits
+        return self.distance(self.parent(a), self.parent(b))
 
 
 def solve(data):
-    orbiting = {}
-    for line in data:
-        orbitee, orbiter = line.split(")")
-        orbiting[orbiter] = orbitee
-    scores = defaultdict(int)
-    for orbiter, orbitee in orbiting.items():
-        scores[orbitee] += 1
-        while (orbitee := orbiting.get(orbitee, None)) is not None:
-            scores[orbitee] += 1
-    total_orbits = sum(scores.values())
-
-    adjacencies = defaultdict(set)
-    for orbiter, orbitee in orbiting.items():
-        adjacencies[orbitee].add(orbiter)
-        adjacencies[orbiter].add(orbitee)
-    START = orbiting["YOU"]
-    END = orbiting["SAN"]
-    seen = {"YOU", "SAN", START}
-    q = deque(((START, 0),))
-    while q:
-        node, transfers = q.popleft()
-        if node == END:
-            return total_orbits, transfers
-        transfers += 1
-        for adj in adjacencies[node]:
-            if adj in seen:
-                continue
-            seen.add(adj)
-            q.append((adj, transfers))
-    return total_orbits, None
+    orbits = OrbitMap(data)
+    return orbits.total_orbits(), orbits.transfers("YOU", "SAN")
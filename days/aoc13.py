@@ -1,12 +1,16 @@
-from collections import defaultdict
-from enum import IntEnum
-from util import ints
+from intcode import IntcodeComputer, StepResponse
+from util import Framebuffer, ints
+import numpy as np
+import struct
 
 fmt_dict = {"sep": None}
-param_counts = {1: 3, 2: 3, 3: 1, 4: 1, 5: 2, 6: 2, 7: 3, 8: 3, 9: 1, 99: 0}
 index_to_direction = [(-1, 0), (0, 1), (1, 0), (0, -1)]
 direction_to_index = {(-1, 0): 0, (0, 1): 1, (1, 0): 2, (0, -1): 3}
 tiles = [" ", "#", ".", "_", "O"]
+CALIBRATION_FRAMES = 16
+# one delta per record: frame number, x, y and tile id (or score when x is -1)
+RECORD = np.dtype([("frame", "<u4"), ("x", "<i2"), ("y", "<i2"), ("value", "<i4")])
+PACK_RECORD = struct.Struct("<Ihhi").pack
 
 
 def rotate(i, j, d):
@@ -14,203 +18,163 @@ def rotate(i, j, d):
     return index_to_direction[(direction_to_index[i, j] + offset) % 4]
 
 
-class StepResponse(IntEnum):
-    SUCCESS = 0
-    WAITING_FOR_INPUT = 1
-    PROVIDED_OUTPUT = 2
-    STOPPED = 3
-
-
-class OutputValue(IntEnum):
-    X = 0
-    Y = 1
-    TILE_ID = 2
-
-
-class Memory(list):
-    def __getitem__(self, i):
-        if i >= len(self):
-            self.extend([0] * (i - len(self) + 1))
-        return super().__getitem__(i)
-
-    def __setitem__(self, i, v):
-        if i >= len(self):
-            self.extend([0] * (i - len(self) + 1))
-        return super().__setitem__(i, v)
-
-
-class IntcodeComputer:
-    def __init__(self, arr, inputs):
-        self.__i = 0
-        self.__b = 0
-        self.__arr = Memory(arr)
-        self.__active = True
-        self.__inputs = inputs
-
-    @staticmethod
-    def parse_instruction(n):
-        n = str(n)
-        op = int(n[-2:])
-        i = len(n) - 3
-        modes = []
-        for _ in range(param_counts.get(op, 0)):
-            if i >= 0:
-                modes.append(int(n[i]))
-                i -= 1
+class ReplayLog:
+    def __init__(self):
+        self.frame = 0
+        self.stream = bytearray()
+
+    def tile(self, x, y, tile_id):
+        self.stream += PACK_RECORD(self.frame, x, y, tile_id)
+
+    def score(self, score):
+        self.tile(-1, 0, score)
+
+    def next_frame(self):
+        self.frame += 1
+
+
+class Replayer:
+    def __init__(self, stream, keyframe_interval=256):
+        self.__records = np.frombuffer(bytes(stream), dtype=RECORD)
+        self.__interval = keyframe_interval
+        # a keyframe for frame f holds the board and score after every record
+        # from earlier frames, and where the records for frame f start
+        self.__keyframes = []
+        screen, score, start = Framebuffer(), 0, 0
+        frames = self.__records["frame"]
+        last = int(frames[-1]) if len(frames) else 0
+        for frame in range(0, last + 1, keyframe_interval):
+            end = int(np.searchsorted(frames, frame))
+            score = self.__apply(screen, score, start, end)
+            self.__keyframes.append((end, screen.copy(), score))
+            start = end
+        self.seek(0)
+
+    def __apply(self, screen, score, start, end):
+        for _, x, y, value in self.__records[start:end].tolist():
+            if x == -1 and y == 0:
+                score = value
             else:
-                modes.append(0)
-        return op, modes
+                screen[y, x] = value
+        return score
 
     @property
-    def memory(self):
-        return self.__arr
-
-    def is_active(self):
-        return self.__active
-
-    def append_input(self, value):
-        self.__inputs.append(value)
-
-    def step(self):
-        if not self.__active:
-            return StepResponse.STOPPED
-        op, modes = IntcodeComputer.parse_instruction(self.__arr[self.__i])
-        params = []
-        for di, mode in enumerate(modes):
-            params.append(
-                self.__arr[self.__arr[self.__i + di + 1]]
-                if mode == 0  # position mode
-                else self.__arr[self.__i + di + 1]
-                if mode == 1  # absolute mode
-                else self.__arr[self.__b + self.__arr[self.__i + di + 1]]
-                if mode == 2  # relative mode
-                else None
-            )
-        match op:
-            case 1:  # add
-                a, b, *_ = params
-                self.__arr[
-                    self.__arr[self.__i + 3] + (self.__b if modes[-1] == 2 else 0)
-                ] = (a + b)
-                self.__i += 4
-            case 2:  # multiply
-                a, b, *_ = params
-                self.__arr[
-                    self.__arr[self.__i + 3] + (self.__b if modes[-1] == 2 else 0)
-                ] = (a * b)
-                self.__i += 4
-            case 3:  # input
-                if len(self.__inputs) == 0:
-                    return StepResponse.WAITING_FOR_INPUT
-                self.__arr[
-                    self.__arr[self.__i + 1] + (self.__b if modes[-1] == 2 else 0)
-                ] = self.__inputs.pop(0)
-                self.__i += 2
-            case 4:  # output
-                self.__i += 2
-                return StepResponse.PROVIDED_OUTPUT, params[0]
-            case 5:  # jump if true
-                if params[0] != 0:
-                    self.__i = params[1]
-                else:
-                    self.__i += 3
-            case 6:  # jump if false
-                if params[0] == 0:
-                    self.__i = params[1]
-                else:
-                    self.__i += 3
-            case 7:  # less than
-                self.__arr[
-                    self.__arr[self.__i + 3] + (self.__b if modes[-1] == 2 else 0)
-                ] = (1 if params[0] < params[1] else 0)
-                self.__i += 4
-            case 8:  # equal to
-                self.__arr[
-                    self.__arr[self.__i + 3] + (self.__b if modes[-1] == 2 else 0)
-                ] = (1 if params[0] == params[1] else 0)
-                self.__i += 4
-            case 9:  # relative base offset
-                self.__b += params[0]
-                self.__i += 2
-            case 99:
-                self.__active = False
-                return StepResponse.STOPPED
-            case _:
-                raise ValueError()
-        return StepResponse.SUCCESS
+    def frames(self):
+        return int(self.__records["frame"][-1]) + 1 if len(self.__records) else 0
+
+    def seek(self, frame):
+        if not 0 <= frame < max(self.frames, 1):
+            raise ValueError(f"frame {frame} is outside the recording")
+        start, screen, score = self.__keyframes[frame // self.__interval]
+        end = int(np.searchsorted(self.__records["frame"], frame, side="right"))
+        self.screen = screen.copy()
+        self.score = self.__apply(self.screen, score, start, end)
+        self.frame = frame
+        return self.screen.render(tiles)
 
 
 class ArcadeCabinet:
-    def __init__(self, arr):
+    def __init__(self, arr, profiler=None, record=False):
         self.__arr = arr
-        self.__screen = defaultdict(int)
+        self.__profiler = profiler
+        self.__record = record
+        self.__screen = Framebuffer()
         self.reset()
 
     def reset(self, playable=False):
-        self.__cpu = IntcodeComputer(self.__arr, [])
+        self.__cpu = IntcodeComputer(
+            self.__arr, [], compiled=True, profiler=self.__profiler
+        )
         if playable:
             self.__cpu.memory[0] = 2
         self.__screen.clear()
+        self.log = ReplayLog() if self.__record else None
         self.score = 0
         self.__paddle_x = None
         self.__ball_x = None
 
     def run(self):
-        expected_value = OutputValue.X
-        x, y = None, None
         while self.__cpu.is_active():
-            match self.__cpu.step():
-                case StepResponse.WAITING_FOR_INPUT:
-                    if self.__paddle_x == self.__ball_x:
-                        self.__cpu.append_input(0)
-                    elif self.__paddle_x > self.__ball_x:
-                        self.__cpu.append_input(-1)
-                    else:
-                        self.__cpu.append_input(1)
+            match self.__cpu.run_until_n_outputs(3):
+                case StepResponse.WAITING_FOR_INPUT, _:
+                    self.__cpu.append_input(self.__joystick())
                     self.__screen.clear()
-                case StepResponse.PROVIDED_OUTPUT, out_value:
-                    match expected_value:
-                        case OutputValue.X:
-                            x = out_value
-                            expected_value = OutputValue.Y
-                        case OutputValue.Y:
-                            y = out_value
-                            expected_value = OutputValue.TILE_ID
-                        case OutputValue.TILE_ID:
-                            if x == -1 and y == 0:
-                                self.score = out_value
-                            else:
-                                self.__screen[y, x] = out_value
-                                if out_value == 3:
-                                    self.__paddle_x = x
-                                elif out_value == 4:
-                                    self.__ball_x = x
-                            expected_value = OutputValue.X
-
-    def __get_bounds(self):
-        bounds = [None] * 4
-        for y, x in self.__screen:
-            if bounds[0] is None or y < bounds[0]:
-                bounds[0] = y
-            if bounds[1] is None or y > bounds[1]:
-                bounds[1] = y
-            if bounds[2] is None or x < bounds[2]:
-                bounds[2] = x
-            if bounds[3] is None or x > bounds[3]:
-                bounds[3] = x
-        return bounds
+                    if self.log is not None:
+                        self.log.next_frame()
+                case StepResponse.PROVIDED_OUTPUT, (-1, 0, score):
+                    self.score = score
+                    if self.log is not None:
+                        self.log.score(score)
+                case StepResponse.PROVIDED_OUTPUT, (x, y, tile_id):
+                    self.__draw(x, y, tile_id)
+                    if self.log is not None:
+                        self.log.tile(x, y, tile_id)
+
+    def __joystick(self):
+        if self.__paddle_x == self.__ball_x:
+            return 0
+        return -1 if self.__paddle_x > self.__ball_x else 1
+
+    def __draw(self, x, y, tile_id):
+        self.__screen[y, x] = tile_id
+        if tile_id == 3:
+            self.__paddle_x = x
+        elif tile_id == 4:
+            self.__ball_x = x
+
+    def __draw_frame(self, outputs):
+        self.__screen.clear()
+        for x, y, tile_id in zip(*[iter(outputs)] * 3):
+            if (x, y) == (-1, 0):
+                self.score = tile_id
+            else:
+                self.__draw(x, y, tile_id)
+
+    def fast_forward(self):
+        # headless play: render frames only until the memory cells holding the
+        # ball x and paddle x are pinned down, then steer from those cells and
+        # let each frame's tiles go unparsed; the score still comes from output
+        if self.log is not None:
+            return self.run()
+        cpu = self.__cpu
+        memory = cpu.memory
+        cells = None
+        for _ in range(CALIBRATION_FRAMES):
+            self.__draw_frame(cpu.run())
+            if not cpu.is_active():
+                return
+            values = self.__ball_x, self.__paddle_x
+            if cells is None:
+                cells = [range(len(self.__arr))] * 2
+            cells = [[a for a in c if memory[a] == v] for c, v in zip(cells, values)]
+            if not (cells[0] and cells[1]):
+                break
+            cpu.append_input(self.__joystick())
+            if len(cells[0]) == len(cells[1]) == 1:
+                break
+        if not len(cells[0]) == len(cells[1]) == 1:
+            # the positions are not kept in single plain cells; play it rendered
+            return self.run()
+        (ball,), (paddle,) = cells
+        while cpu.is_active():
+            outputs = cpu.run()
+            for k in range(len(outputs) - 3, -1, -3):
+                if outputs[k] == -1 and outputs[k + 1] == 0:
+                    self.score = outputs[k + 2]
+                    break
+            self.__ball_x, self.__paddle_x = memory[ball], memory[paddle]
+            if cpu.is_active():
+                cpu.append_input(self.__joystick())
+        # leave the screen showing the last frame, as run does
+        self.__draw_frame(outputs)
 
     @property
     def block_count(self):
-        return sum(tile == 2 for tile in self.__screen.values())
+        return self.__screen.count(2)
 
     @property
     def screen(self):
-        bounds = self.__get_bounds()
-        return "\n".join(
-            "".join(tiles[self.__screen[y, x]] for x in range(bounds[2], bounds[3] + 1))
-            for y in range(bounds[0], bounds[1] + 1)
-        )
+        return self.__screen.render(tiles)
 
 
 def solve(data):
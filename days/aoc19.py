@@ -1,129 +1,8 @@
-from collections import defaultdict
-from enum import IntEnum
+from intcode import BatchIntcodeComputer, IntcodeComputer, StepResponse
+import numpy as np
 from util import ints
 
 fmt_dict = {"sep": None}
-param_counts = {1: 3, 2: 3, 3: 1, 4: 1, 5: 2, 6: 2, 7: 3, 8: 3, 9: 1, 99: 0}
-
-
-class StepResponse(IntEnum):
-    SUCCESS = 0
-    WAITING_FOR_INPUT = 1
-    PROVIDED_OUTPUT = 2
-    STOPPED = 3
-
-
-class Memory(list):
-    def __getitem__(self, i):
-        if i >= len(self):
-            self.extend([0] * (i - len(self) + 1))
-        return super().__getitem__(i)
-
-    def __setitem__(self, i, v):
-        if i >= len(self):
-            self.extend([0] * (i - len(self) + 1))
-        return super().__setitem__(i, v)
-
-
-class IntcodeComputer:
-    def __init__(self, arr, inputs):
-        self.__i = 0
-        self.__b = 0
-        self.__arr = Memory(arr)
-        self.__active = True
-        self.__inputs = inputs
-
-    @staticmethod
-    def parse_instruction(n):
-        n = str(n)
-        op = int(n[-2:])
-        i = len(n) - 3
-        modes = []
-        for _ in range(param_counts.get(op, 0)):
-            if i >= 0:
-                modes.append(int(n[i]))
-                i -= 1
-            else:
-                modes.append(0)
-        return op, modes
-
-    @property
-    def memory(self):
-        return self.__arr
-
-    def is_active(self):
-        return self.__active
-
-    def append_input(self, value):
-        self.__inputs.append(value)
-
-    def step(self):
-        if not self.__active:
-            return StepResponse.STOPPED
-        op, modes = IntcodeComputer.parse_instruction(self.__arr[self.__i])
-        params = []
-        for di, mode in enumerate(modes):
-            params.append(
-                self.__arr[self.__arr[self.__i + di + 1]]
-                if mode == 0  # position mode
-                else self.__arr[self.__i + di + 1]
-                if mode == 1  # absolute mode
-                else self.__arr[self.__b + self.__arr[self.__i + di + 1]]
-                if mode == 2  # relative mode
-                else None
-            )
-        match op:
-            case 1:  # add
-                a, b, *_ = params
-                self.__arr[
-                    self.__arr[self.__i + 3] + (self.__b if modes[-1] == 2 else 0)
-                ] = (a + b)
-                self.__i += 4
-            case 2:  # multiply
-                a, b, *_ = params
-                self.__arr[
-                    self.__arr[self.__i + 3] + (self.__b if modes[-1] == 2 else 0)
-                ] = (a * b)
-                self.__i += 4
-            case 3:  # input
-                if len(self.__inputs) == 0:
-                    return StepResponse.WAITING_FOR_INPUT
-                self.__arr[
-                    self.__arr[self.__i + 1] + (self.__b if modes[-1] == 2 else 0)
-                ] = self.__inputs.pop(0)
-                self.__i += 2
-            case 4:  # output
-                self.__i += 2
-                return StepResponse.PROVIDED_OUTPUT, params[0]
-            case 5:  # jump if true
-                if params[0] != 0:
-                    self.__i = params[1]
-                else:
-                    self.__i += 3
-            case 6:  # jump if false
-                if params[0] == 0:
-                    self.__i = params[1]
-                else:
-                    self.__i += 3
-            case 7:  # less than
-                self.__arr[
-                    self.__arr[self.__i + 3] + (self.__b if modes[-1] == 2 else 0)
-                ] = (1 if params[0] < params[1] else 0)
-                self.__i += 4
-            case 8:  # equal to
-                self.__arr[
-                    self.__arr[self.__i + 3] + (self.__b if modes[-1] == 2 else 0)
-                ] = (1 if params[0] == params[1] else 0)
-                self.__i += 4
-            case 9:  # relative base offset
-                self.__b += params[0]
-                self.__i += 2
-            case 99:
-                self.__active = False
-                return StepResponse.STOPPED
-            case _:
-                raise ValueError()
-        return StepResponse.SUCCESS
 
 
 class TractorBeamGrid:
@@ -145,11 +24,18 @@ class TractorBeamGrid:
             return ret
         self.__cpu = IntcodeComputer(self.__arr, [x, y])
         while self.__cpu.is_active():
-            match self.__cpu.step():
+            match self.__cpu.run_until_io():
                 case StepResponse.PROVIDED_OUTPUT, ret:
                     self.__beam[x, y] = ret
                     return ret
 
+    def scan(self, n):
+        xs, ys = np.divmod(np.arange(n * n), n)
+        cpu = BatchIntcodeComputer(self.__arr, np.column_stack((xs, ys)))
+        beam = cpu.run()
+        self.__beam.update(zip(zip(xs.tolist(), ys.tolist()), beam.tolist()))
+        return beam.reshape(n, n).astype(bool)
+
     def __get_y_bounds(self, x):
         yl = int(x * self.__m1)
         if self.is_in_beam(x, yl):
@@ -199,17 +85,11 @@ class TractorBeamGrid:
 def solve(data):
     arr = ints(data)
     grid = TractorBeamGrid(arr)
-    ans1 = 0
-    beam = defaultdict(set)
     N = 50
-    for x in range(N):
-        for y in range(N):
-            if grid.is_in_beam(x, y):
-                beam[x].add(y)
-                ans1 += 1
+    beam = grid.scan(N)
     for x in range(N - 1, -1, -1):
-        ys = beam[x]
-        if ys and not {0, N - 1} & ys:
-            grid.set_slopes(min(ys) / x, max(ys) / x)
+        ys = np.flatnonzero(beam[x])
+        if ys.size and ys[0] != 0 and ys[-1] != N - 1:
+            grid.set_slopes(ys[0] / x, ys[-1] / x)
             break
-    return ans1, grid.find_square()
+    return int(beam.sum()), grid.find_square()
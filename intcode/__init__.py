@@ -0,0 +1,9 @@
+from .amplifiers import run_amplifiers, search_phases, search_prefixes
+from .batch import BatchIntcodeComputer
+from .channels import InputChannel, OutputChannel
+from .compiler import compile_block
+from .computer import IntcodeComputer, StepResponse
+from .instructions import decode, param_counts
+from .memory import Memory
+from .network import IntcodeNetwork
+from .profiler import Profiler
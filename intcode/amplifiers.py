@@ -0,0 +1,49 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import permutations
+from .computer import IntcodeComputer
+from .network import IntcodeNetwork
+
+program = None
+
+
+def run_amplifiers(arr, phases, feedback=False):
+    amps = [IntcodeComputer(arr, [phase]) for phase in phases]
+    network = IntcodeNetwork.chain(amps, loop=feedback)
+    network.send(0, 0)
+    outputs = network.run()[len(amps) - 1]
+    return outputs[-1] if outputs else None
+
+
+def search_prefixes(arr, phases, signal=0):
+    # walk the trie of phase prefixes depth first, so each prefix runs its
+    # last amplifier once and every permutation extending it reuses the signal
+    phases = tuple(phases)
+    best = None
+    stack = [((), signal)]
+    while stack:
+        prefix, signal = stack.pop()
+        if len(prefix) == len(phases):
+            best = max(best or (signal, prefix), (signal, prefix))
+            continue
+        for phase in phases:
+            if phase not in prefix:
+                out = IntcodeComputer(arr, [phase, signal]).run()
+                stack.append(((*prefix, phase), out[-1]))
+    return best
+
+
+def init_worker(arr):
+    # each worker keeps its own copy of the program across tasks
+    global program
+    program = arr
+
+
+def evaluate(task):
+    phases, feedback = task
+    return run_amplifiers(program, phases, feedback), phases
+
+
+def search_phases(arr, phases, feedback=False, workers=None, chunksize=8):
+    tasks = ((p, feedback) for p in permutations(phases))
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(arr,)) as pool:
+        return max(pool.map(evaluate, tasks, chunksize=chunksize))
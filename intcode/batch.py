@@ -0,0 +1,110 @@
+import numpy as np
+from .instructions import decode, param_counts
+
+
+class BatchIntcodeComputer:
+    def __init__(self, arr, inputs):
+        inputs = np.asarray(inputs, dtype=np.int64)
+        if inputs.ndim == 1:
+            inputs = inputs[:, None]
+        n = len(inputs)
+        self.__inputs = inputs
+        self.__input_index = np.zeros(n, dtype=np.int64)
+        self.__arr = np.tile(np.asarray(arr, dtype=np.int64), (n, 1))
+        self.__i = np.zeros(n, dtype=np.int64)
+        self.__b = np.zeros(n, dtype=np.int64)
+        self.__active = np.ones(n, dtype=bool)
+
+    @property
+    def memory(self):
+        return self.__arr
+
+    def __grow(self, addresses):
+        size = int(np.max(addresses)) + 1
+        n = self.__arr.shape[1]
+        if size > n:
+            self.__arr = np.pad(self.__arr, ((0, 0), (0, max(size, 2 * n) - n)))
+
+    def __read(self, idx, i, mode):
+        raw = self.__arr[idx, i]
+        match mode:
+            case 0:  # position mode
+                self.__grow(raw)
+                return self.__arr[idx, raw]
+            case 1:  # absolute mode
+                return raw
+            case 2:  # relative mode
+                raw = raw + self.__b[idx]
+                self.__grow(raw)
+                return self.__arr[idx, raw]
+
+    def __address(self, idx, i, mode):
+        raw = self.__arr[idx, i]
+        if mode == 2:
+            raw = raw + self.__b[idx]
+        self.__grow(raw)
+        return raw
+
+    def __execute(self, idx, i, instruction, outputs, counts):
+        op, m1, m2, m3 = instruction
+        self.__grow(i + param_counts[op])
+        match op:
+            case 1:  # add
+                x = self.__read(idx, i + 1, m1)
+                y = self.__read(idx, i + 2, m2)
+                address = self.__address(idx, i + 3, m3)
+                self.__arr[idx, address] = x + y
+            case 2:  # multiply
+                x = self.__read(idx, i + 1, m1)
+                y = self.__read(idx, i + 2, m2)
+                address = self.__address(idx, i + 3, m3)
+                self.__arr[idx, address] = x * y
+            case 3:  # input
+                k = self.__input_index[idx]
+                if (k >= self.__inputs.shape[1]).any():
+                    raise ValueError(f"instruction at {i} needs more inputs")
+                address = self.__address(idx, i + 1, m1)
+                self.__arr[idx, address] = self.__inputs[idx, k]
+                self.__input_index[idx] += 1
+            case 4:  # output
+                outputs[idx, counts[idx]] = self.__read(idx, i + 1, m1)
+                counts[idx] += 1
+                self.__active[idx] = counts[idx] < outputs.shape[1]
+            case 5 | 6:  # jump if true, jump if false
+                x = self.__read(idx, i + 1, m1)
+                y = self.__read(idx, i + 2, m2)
+                jump = (x != 0) if op == 5 else (x == 0)
+                self.__i[idx] = np.where(jump, y, i + 3)
+                return
+            case 7:  # less than
+                x = self.__read(idx, i + 1, m1)
+                y = self.__read(idx, i + 2, m2)
+                address = self.__address(idx, i + 3, m3)
+                self.__arr[idx, address] = x < y
+            case 8:  # equal to
+                x = self.__read(idx, i + 1, m1)
+                y = self.__read(idx, i + 2, m2)
+                address = self.__address(idx, i + 3, m3)
+                self.__arr[idx, address] = x == y
+            case 9:  # relative base offset
+                self.__b[idx] += self.__read(idx, i + 1, m1)
+            case 99:
+                self.__active[idx] = False
+                return
+        self.__i[idx] = i + param_counts[op] + 1
+
+    def run(self, n_outputs=1):
+        n = len(self.__i)
+        outputs = np.zeros((n, n_outputs), dtype=np.int64)
+        counts = np.zeros(n, dtype=np.int64)
+        while (live := np.flatnonzero(self.__active)).size:
+            pcs = self.__i[live]
+            self.__grow(pcs)
+            # instances sharing a pc and instruction word advance together
+            for i in np.unique(pcs).tolist():
+                at_pc = live[pcs == i]
+                words = self.__arr[at_pc, i]
+                for word in np.unique(words).tolist():
+                    idx = at_pc[words == word]
+                    self.__execute(idx, i, decode(word), outputs, counts)
+        return outputs[:, 0] if n_outputs == 1 else outputs
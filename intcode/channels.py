@@ -0,0 +1,20 @@
+from array import array
+from collections import deque
+
+
+class InputChannel(deque):
+    def feed_ascii(self, text):
+        self.extend(text.encode("ascii"))
+
+
+class OutputChannel(list):
+    def drain(self):
+        values = array("q", self)
+        self.clear()
+        return values
+
+    def read_ascii(self):
+        n = next((k for k, v in enumerate(self) if not 0 <= v < 128), len(self))
+        text = bytes(self[:n]).decode("ascii")
+        del self[:n]
+        return text
@@ -0,0 +1,125 @@
+from .instructions import decode, param_counts
+from .memory import DENSE_PAGES, PAGE_BITS, PAGE_MASK
+
+BLOCK_OPS = {1, 2, 5, 6, 7, 8, 9}
+
+
+def page_expr(address):
+    return f"pages[({address}) >> {PAGE_BITS}][({address}) & {PAGE_MASK}]"
+
+
+def read_expr(param, mode):
+    match mode:
+        case 0:  # position mode
+            if param < 0 or param >> PAGE_BITS >= DENSE_PAGES:
+                return f"mem[{param}]"
+            return f"pages[{param >> PAGE_BITS}][{param & PAGE_MASK}]"
+        case 1:  # absolute mode
+            return str(param)
+        case 2:  # relative mode
+            return page_expr(f"b + {param}")
+
+
+def slow_read_expr(param, mode):
+    match mode:
+        case 0:  # position mode
+            return f"mem[{param}]"
+        case 1:  # absolute mode
+            return str(param)
+        case 2:  # relative mode
+            return f"mem[b + {param}]"
+
+
+def write_lines(param, mode, value, next_pc):
+    if mode == 2:
+        lines = [f"a = b + {param}"]
+        page, offset, address = f"a >> {PAGE_BITS}", f"a & {PAGE_MASK}", "a"
+    else:
+        lines = []
+        page, offset, address = param >> PAGE_BITS, param & PAGE_MASK, param
+    # a write into compiled code ends the block so the change is seen
+    return lines + [
+        f"if {address} in code:",
+        f"    mem[{address}] = {value}",
+        f"    return {next_pc}, b",
+        f"if {page} in owned and {offset} not in decoded.get({page}, ()):",
+        f"    pages[{page}][{offset}] = {value}",
+        "else:",
+        f"    mem[{address}] = {value}",
+    ]
+
+
+def block_source(mem, pc):
+    lines = []
+    addresses = []
+    i = pc
+    while i not in mem.modified_code:
+        try:
+            op, *modes = decode(mem[i])
+        except ValueError:
+            break
+        n = param_counts[op]
+        if op not in BLOCK_OPS or any(
+            i + di in mem.modified_code for di in range(1, n + 1)
+        ):
+            break
+        params = [mem[i + di] for di in range(1, n + 1)]
+        addresses.extend(range(i, i + n + 1))
+        # reads outside the page table fall back to Memory lookups
+        reads = list(zip("xy", params, modes))
+        if all(m == 1 for _, _, m in reads):
+            lines.extend(f"{v} = {p}" for v, p, _ in reads)
+        else:
+            lines.append("try:")
+            lines.extend(f"    {v} = {read_expr(p, m)}" for v, p, m in reads)
+            lines.append("except IndexError:")
+            lines.extend(f"    {v} = {slow_read_expr(p, m)}" for v, p, m in reads)
+        i += n + 1
+        match op:
+            case 5:  # jump if true
+                lines.append("if x != 0:")
+                lines.append("    return y, b")
+                break
+            case 6:  # jump if false
+                lines.append("if x == 0:")
+                lines.append("    return y, b")
+                break
+            case 9:  # relative base offset
+                lines.append("b += x")
+            case 1:  # add
+                lines.extend(write_lines(params[2], modes[2], "x + y", i))
+            case 2:  # multiply
+                lines.extend(write_lines(params[2], modes[2], "x * y", i))
+            case 7:  # less than
+                lines.extend(write_lines(params[2], modes[2], "1 if x < y else 0", i))
+            case 8:  # equal to
+                lines.extend(write_lines(params[2], modes[2], "1 if x == y else 0", i))
+    if not lines:
+        return None, addresses
+    lines.append(f"return {i}, b")
+    body = "\n".join(f"    {line}" for line in lines)
+    return (
+        f"def block_{pc}(b, mem=mem, pages=pages, owned=owned, decoded=decoded, "
+        f"code=code):\n{body}\n",
+        addresses,
+    )
+
+
+def compile_block(mem, pc):
+    source, addresses = block_source(mem, pc)
+    if source is None:
+        block = False
+    else:
+        namespace = {
+            "mem": mem,
+            "pages": mem.pages,
+            "owned": mem.owned,
+            "decoded": mem.decoded,
+            "code": mem.code,
+        }
+        exec(source, namespace)
+        block = namespace[f"block_{pc}"]
+    mem.blocks[pc] = block
+    for i in addresses or (pc,):
+        mem.code.setdefault(i, set()).add(pc)
+    return block
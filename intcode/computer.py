@@ -0,0 +1,220 @@
+from enum import IntEnum
+from .channels import InputChannel, OutputChannel
+from .compiler import compile_block
+from .instructions import decode
+from .memory import PAGE_BITS, PAGE_MASK, Memory
+
+
+class StepResponse(IntEnum):
+    SUCCESS = 0
+    WAITING_FOR_INPUT = 1
+    PROVIDED_OUTPUT = 2
+    STOPPED = 3
+
+
+class IntcodeComputer:
+    def __init__(self, arr, inputs=None, compiled=False, profiler=None):
+        self.__i = 0
+        self.__b = 0
+        self.__arr = arr if isinstance(arr, Memory) else Memory(arr)
+        self.__active = True
+        self.__inputs = InputChannel(() if inputs is None else inputs)
+        self.__compiled = compiled
+        self.__profiler = profiler
+
+    @property
+    def memory(self):
+        return self.__arr
+
+    def is_active(self):
+        return self.__active
+
+    @property
+    def inputs(self):
+        return self.__inputs
+
+    def append_input(self, value):
+        self.__inputs.append(value)
+
+    def feed_ascii(self, text):
+        self.__inputs.feed_ascii(text)
+
+    def snapshot(self):
+        return self.__i, self.__b, self.__active, list(self.__inputs), self.__arr.fork()
+
+    def restore(self, snapshot):
+        self.__i, self.__b, self.__active, inputs, arr = snapshot
+        self.__inputs = InputChannel(inputs)
+        self.__arr = arr.fork()
+
+    def fork(self):
+        cpu = IntcodeComputer((), compiled=self.__compiled, profiler=self.__profiler)
+        cpu.restore(self.snapshot())
+        return cpu
+
+    def __read(self, i, mode, b):
+        match mode:
+            case 0:  # position mode
+                return self.__arr[self.__arr[i]]
+            case 1:  # absolute mode
+                return self.__arr[i]
+            case 2:  # relative mode
+                return self.__arr[b + self.__arr[i]]
+
+    def __execute(self, n_outputs, budget):
+        arr = self.__arr
+        pages = arr.pages
+        owned = arr.owned
+        decoded = arr.decoded
+        code = arr.code
+        inputs = self.__inputs
+        outputs = OutputChannel()
+        i = self.__i
+        b = self.__b
+        response = StepResponse.SUCCESS
+        while budget:
+            budget -= 1
+            try:
+                instruction = decoded[i >> PAGE_BITS][i & PAGE_MASK]
+            except KeyError:
+                instruction = arr.decode(i)
+            op, m1, m2, m3 = instruction
+            if op == 99:
+                self.__active = False
+                response = StepResponse.STOPPED
+                break
+            if op == 3:  # input
+                if len(inputs) == 0:
+                    response = StepResponse.WAITING_FOR_INPUT
+                    break
+                arr[arr[i + 1] + (b if m1 == 2 else 0)] = inputs.popleft()
+                i += 2
+                continue
+            # in-range reads index the page table directly and only fall
+            # back to Memory lookups for unallocated or sparse pages
+            try:
+                x = pages[(i + 1) >> PAGE_BITS][(i + 1) & PAGE_MASK]
+                if m1 == 0:  # position mode
+                    x = pages[x >> PAGE_BITS][x & PAGE_MASK]
+                elif m1 == 2:  # relative mode
+                    x = pages[(b + x) >> PAGE_BITS][(b + x) & PAGE_MASK]
+            except IndexError:
+                x = self.__read(i + 1, m1, b)
+            match op:
+                case 4:  # output
+                    i += 2
+                    outputs.append(x)
+                    if len(outputs) == n_outputs:
+                        response = StepResponse.PROVIDED_OUTPUT
+                        break
+                    continue
+                case 9:  # relative base offset
+                    b += x
+                    i += 2
+                    continue
+            try:
+                y = pages[(i + 2) >> PAGE_BITS][(i + 2) & PAGE_MASK]
+                if m2 == 0:
+                    y = pages[y >> PAGE_BITS][y & PAGE_MASK]
+                elif m2 == 2:
+                    y = pages[(b + y) >> PAGE_BITS][(b + y) & PAGE_MASK]
+            except IndexError:
+                y = self.__read(i + 2, m2, b)
+            match op:
+                case 5:  # jump if true
+                    i = y if x != 0 else i + 3
+                    continue
+                case 6:  # jump if false
+                    i = y if x == 0 else i + 3
+                    continue
+                case 1:  # add
+                    value = x + y
+                case 2:  # multiply
+                    value = x * y
+                case 7:  # less than
+                    value = 1 if x < y else 0
+                case 8:  # equal to
+                    value = 1 if x == y else 0
+            try:
+                a = pages[(i + 3) >> PAGE_BITS][(i + 3) & PAGE_MASK]
+            except IndexError:
+                a = arr[i + 3]
+            if m3 == 2:
+                a += b
+            p = a >> PAGE_BITS
+            if p in owned and a not in code and a & PAGE_MASK not in decoded.get(p, ()):
+                pages[p][a & PAGE_MASK] = value
+            else:
+                arr[a] = value
+            i += 4
+        self.__i = i
+        self.__b = b
+        return response, outputs
+
+    def __execute_compiled(self, n_outputs):
+        blocks = self.__arr.blocks
+        outputs = OutputChannel()
+        while True:
+            block = blocks.get(self.__i, None)
+            if block is None:
+                block = compile_block(self.__arr, self.__i)
+            if block:
+                self.__i, self.__b = block(self.__b)
+                continue
+            # io, halts and self-modified code go through the interpreter
+            remaining = None if n_outputs is None else n_outputs - len(outputs)
+            response, new_outputs = self.__execute(remaining, 1)
+            outputs.extend(new_outputs)
+            if response != StepResponse.SUCCESS:
+                return response, outputs
+
+    def __execute_profiled(self, n_outputs, budget):
+        outputs = OutputChannel()
+        while budget:
+            budget -= 1
+            pc = self.__i
+            op = decode(self.__arr[pc])[0]
+            remaining = None if n_outputs is None else n_outputs - len(outputs)
+            response, new_outputs = self.__execute(remaining, 1)
+            if response != StepResponse.WAITING_FOR_INPUT:
+                self.__profiler.record(pc, op, self.__i)
+            outputs.extend(new_outputs)
+            if response != StepResponse.SUCCESS:
+                return response, outputs
+        return StepResponse.SUCCESS, outputs
+
+    def __run(self, n_outputs, budget=-1):
+        # profiling is a separate loop so the fast paths stay untouched
+        if self.__profiler is not None:
+            return self.__execute_profiled(n_outputs, budget)
+        if self.__compiled and budget < 0:
+            return self.__execute_compiled(n_outputs)
+        return self.__execute(n_outputs, budget)
+
+    def step(self):
+        if not self.__active:
+            return StepResponse.STOPPED
+        match self.__run(1, 1):
+            case StepResponse.PROVIDED_OUTPUT, (out_value,):
+                return StepResponse.PROVIDED_OUTPUT, out_value
+            case response, _:
+                return response
+
+    def run_until_io(self):
+        if not self.__active:
+            return StepResponse.STOPPED
+        match self.__run(1):
+            case StepResponse.PROVIDED_OUTPUT, (out_value,):
+                return StepResponse.PROVIDED_OUTPUT, out_value
+            case response, _:
+                return response
+
+    def run_until_n_outputs(self, n):
+        if not self.__active:
+            return StepResponse.STOPPED, OutputChannel()
+        return self.__run(n)
+
+    def run(self):
+        if not self.__active:
+            return OutputChannel()
+        return self.__run(None)[1]
@@ -0,0 +1,12 @@
+param_counts = {1: 3, 2: 3, 3: 1, 4: 1, 5: 2, 6: 2, 7: 3, 8: 3, 9: 1, 99: 0}
+
+
+def decode(n):
+    op = n % 100
+    if op not in param_counts:
+        raise ValueError(f"invalid opcode {op} in instruction {n}")
+    modes = (n // 100 % 10, n // 1000 % 10, n // 10000 % 10)
+    for mode in modes[: param_counts[op]]:
+        if mode > 2:
+            raise ValueError(f"invalid parameter mode {mode} in instruction {n}")
+    return op, *modes
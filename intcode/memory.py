@@ -0,0 +1,85 @@
+from .instructions import decode
+
+PAGE_BITS = 9
+PAGE_SIZE = 1 << PAGE_BITS
+PAGE_MASK = PAGE_SIZE - 1
+DENSE_PAGES = 1 << 11
+ZERO_PAGE = (0,) * PAGE_SIZE
+
+
+class Memory:
+    def __init__(self, arr=()):
+        arr = list(arr)
+        arr.extend([0] * (-len(arr) % PAGE_SIZE))
+        # the page table covers the first DENSE_PAGES pages, or the whole
+        # program if it is longer; pages above that are only allocated in the
+        # sparse dict once written
+        self.pages = [arr[i : i + PAGE_SIZE] for i in range(0, len(arr), PAGE_SIZE)]
+        self.sparse = {}
+        self.owned = set(range(len(self.pages)))
+        self.sparse_owned = set()
+        # decoded instructions per page; a shared page shares its cache too
+        self.decoded = {}
+        self.blocks = {}
+        self.code = {}
+        self.modified_code = set()
+
+    def is_sparse(self, p):
+        return p >= DENSE_PAGES and p >= len(self.pages)
+
+    def __getitem__(self, i):
+        p = i >> PAGE_BITS
+        if self.is_sparse(p):
+            return self.sparse.get(p, ZERO_PAGE)[i & PAGE_MASK]
+        if p < len(self.pages):
+            return self.pages[p][i & PAGE_MASK]
+        return 0
+
+    def __setitem__(self, i, v):
+        self.__page(i >> PAGE_BITS)[i & PAGE_MASK] = v
+        cache = self.decoded.get(i >> PAGE_BITS)
+        if cache is not None:
+            cache.pop(i & PAGE_MASK, None)
+        if i in self.code:
+            self.invalidate(i)
+
+    def __page(self, p):
+        if self.is_sparse(p):
+            if p not in self.sparse_owned:
+                self.sparse[p] = list(self.sparse.get(p, ZERO_PAGE))
+                if p in self.decoded:
+                    self.decoded[p] = dict(self.decoded[p])
+                self.sparse_owned.add(p)
+            return self.sparse[p]
+        if p >= len(self.pages):
+            self.pages.extend([ZERO_PAGE] * (p - len(self.pages) + 1))
+        if p not in self.owned:
+            self.pages[p] = list(self.pages[p])
+            if p in self.decoded:
+                self.decoded[p] = dict(self.decoded[p])
+            self.owned.add(p)
+        return self.pages[p]
+
+    def decode(self, i):
+        # entries on a shared page stay valid for every copy sharing it
+        cache = self.decoded.get(i >> PAGE_BITS)
+        if cache is None:
+            cache = self.decoded[i >> PAGE_BITS] = {}
+        instruction = cache[i & PAGE_MASK] = decode(self[i])
+        return instruction
+
+    def invalidate(self, i):
+        self.modified_code.add(i)
+        for pc in self.code.pop(i):
+            self.blocks.pop(pc, None)
+
+    def fork(self):
+        # both copies share every page until one of them writes to it
+        memory = Memory()
+        memory.pages = list(self.pages)
+        memory.sparse = dict(self.sparse)
+        memory.decoded = dict(self.decoded)
+        memory.modified_code = set(self.modified_code)
+        self.owned.clear()
+        self.sparse_owned.clear()
+        return memory
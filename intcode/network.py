@@ -0,0 +1,85 @@
+import asyncio
+from collections import defaultdict
+from .channels import OutputChannel
+
+
+class IntcodeNetwork:
+    def __init__(self):
+        self.__machines = {}
+        self.__inboxes = {}
+        self.__routes = defaultdict(list)
+        self.outputs = defaultdict(OutputChannel)
+
+    @classmethod
+    def chain(cls, cpus, loop=False):
+        network = cls()
+        for name, cpu in enumerate(cpus):
+            network.add(name, cpu)
+        for name in range(len(cpus) - 1):
+            network.connect(name, name + 1)
+        if loop:
+            network.connect(len(cpus) - 1, 0)
+        return network
+
+    def add(self, name, cpu):
+        self.__machines[name] = cpu
+        self.__inboxes[name] = asyncio.Queue()
+
+    def connect(self, source, destination):
+        self.__routes[source].append(destination)
+
+    def send(self, name, value):
+        self.__inboxes[name].put_nowait(value)
+
+    def __check_stopped(self):
+        # every machine has halted or is blocked on an empty inbox
+        if self.__idle == len(self.__machines) - len(self.__halted) and all(
+            self.__inboxes[name].empty()
+            for name in self.__machines
+            if name not in self.__halted
+        ):
+            self.__stopped.set()
+
+    async def __drive(self, name, cpu):
+        inbox = self.__inboxes[name]
+        try:
+            while True:
+                outputs = cpu.run()
+                self.outputs[name].extend(outputs)
+                for destination in self.__routes[name]:
+                    for value in outputs:
+                        self.__inboxes[destination].put_nowait(value)
+                if not cpu.is_active():
+                    self.__halted.add(name)
+                    self.__check_stopped()
+                    return
+                if inbox.empty():
+                    self.__idle += 1
+                    self.__check_stopped()
+                    cpu.append_input(await inbox.get())
+                    self.__idle -= 1
+                while not inbox.empty():
+                    cpu.append_input(inbox.get_nowait())
+        except Exception:
+            self.__stopped.set()
+            raise
+
+    async def run_async(self):
+        self.__halted = set()
+        self.__idle = 0
+        self.__stopped = asyncio.Event()
+        tasks = [
+            asyncio.create_task(self.__drive(name, cpu))
+            for name, cpu in self.__machines.items()
+        ]
+        self.__check_stopped()
+        await self.__stopped.wait()
+        for task in tasks:
+            task.cancel()
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                raise result
+        return self.outputs
+
+    def run(self):
+        return asyncio.run(self.run_async())
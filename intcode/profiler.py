@@ -0,0 +1,76 @@
+from collections import Counter, defaultdict
+
+op_names = {
+    1: "add",
+    2: "mul",
+    3: "in",
+    4: "out",
+    5: "jt",
+    6: "jf",
+    7: "lt",
+    8: "eq",
+    9: "rbo",
+    99: "halt",
+}
+
+
+class Profiler:
+    def __init__(self):
+        self.opcodes = Counter()
+        self.addresses = Counter()
+        self.blocks = Counter()
+        self.block_addresses = Counter()
+        self.branches = defaultdict(lambda: [0, 0])
+        self.__ops = {}
+        self.__block = None
+
+    def record(self, pc, op, next_pc):
+        # a basic block starts at the first instruction and after any branch
+        if self.__block is None:
+            self.__block = pc
+            self.blocks[pc] += 1
+        self.__ops[pc] = op
+        self.opcodes[op] += 1
+        self.addresses[pc] += 1
+        self.block_addresses[self.__block, pc] += 1
+        if op == 5 or op == 6:
+            self.branches[pc][next_pc != pc + 3] += 1
+            self.__block = None
+
+    def branch_ratios(self):
+        return {
+            pc: taken / (taken + not_taken)
+            for pc, (not_taken, taken) in self.branches.items()
+        }
+
+    def report(self, top=10):
+        total = sum(self.opcodes.values())
+        lines = [f"{total} instructions", "", "opcode  count     share"]
+        for op, n in self.opcodes.most_common():
+            lines.append(f"{op_names[op]:<6}  {n:<8}  {n / total:6.1%}")
+        lines.extend(["", "address  op     count     share"])
+        for pc, n in self.addresses.most_common(top):
+            op = op_names[self.__ops[pc]]
+            lines.append(f"{pc:<7}  {op:<5}  {n:<8}  {n / total:6.1%}")
+        lines.extend(["", "block    entries   instructions"])
+        block_totals = Counter()
+        for (block, _), n in self.block_addresses.items():
+            block_totals[block] += n
+        for block, n in block_totals.most_common(top):
+            lines.append(f"{block:<7}  {self.blocks[block]:<8}  {n}")
+        lines.extend(["", "branch   taken     total"])
+        ratios = self.branch_ratios()
+        hot_branches = sorted(self.branches, key=lambda pc: -sum(self.branches[pc]))
+        for pc in hot_branches[:top]:
+            lines.append(f"{pc:<7}  {ratios[pc]:6.1%}    {sum(self.branches[pc])}")
+        return "\n".join(lines)
+
+    def folded_stacks(self, name="intcode"):
+        return "\n".join(
+            f"{name};block_{block};{op_names[self.__ops[pc]]}@{pc} {n}"
+            for (block, pc), n in sorted(self.block_addresses.items())
+        )
+
+    def save_folded_stacks(self, path, name="intcode"):
+        with open(path, "w") as f:
+            f.write(self.folded_stacks(name) + "\n")
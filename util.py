@@ -2,6 +2,8 @@ import hashlib
 import heapq
 import numpy as np
 import re
+import struct
+import zlib
 
 
 LETTERS = set("abcdefghijklmnopqrstuvwxyz")
@@ -50,6 +52,119 @@ class PriorityQueue(list):
         return heapq.heappush(self, value)
 
 
+class Framebuffer:
+    def __init__(self, shape=(16, 16), dtype=np.uint8):
+        self.__data = np.zeros(shape, dtype=dtype)
+        self.__written = np.zeros(shape, dtype=bool)
+        self.__origin = (0, 0)
+        self.__bounds = None
+
+    def __grow(self, i, j):
+        rows, cols = self.__data.shape
+        oi, oj = self.__origin
+        # grow geometrically so writes creeping past an edge stay amortized O(1)
+        pad = []
+        for k, n in ((i + oi, rows), (j + oj, cols)):
+            before = max(-k, n) if k < 0 else 0
+            after = max(k + 1 - n, n) if k >= n else 0
+            pad.append((before, after))
+        self.__data = np.pad(self.__data, pad)
+        self.__written = np.pad(self.__written, pad)
+        self.__origin = (oi + pad[0][0], oj + pad[1][0])
+
+    def __index(self, i, j):
+        oi, oj = self.__origin
+        return i + oi, j + oj
+
+    def __getitem__(self, pos):
+        i, j = self.__index(*pos)
+        rows, cols = self.__data.shape
+        if 0 <= i < rows and 0 <= j < cols:
+            return int(self.__data[i, j])
+        return 0
+
+    def __setitem__(self, pos, value):
+        i, j = self.__index(*pos)
+        rows, cols = self.__data.shape
+        if not (0 <= i < rows and 0 <= j < cols):
+            self.__grow(*pos)
+            i, j = self.__index(*pos)
+        self.__data[i, j] = value
+        self.__written[i, j] = True
+        if self.__bounds is None:
+            self.__bounds = [pos[0], pos[0], pos[1], pos[1]]
+        else:
+            b = self.__bounds
+            b[0], b[1] = min(b[0], pos[0]), max(b[1], pos[0])
+            b[2], b[3] = min(b[2], pos[1]), max(b[3], pos[1])
+
+    def copy(self):
+        framebuffer = Framebuffer((0, 0))
+        framebuffer.__data = self.__data.copy()
+        framebuffer.__written = self.__written.copy()
+        framebuffer.__origin = self.__origin
+        framebuffer.__bounds = None if self.__bounds is None else list(self.__bounds)
+        return framebuffer
+
+    def clear(self):
+        self.__data[:] = 0
+        self.__written[:] = False
+        self.__bounds = None
+
+    @property
+    def written(self):
+        return int(np.count_nonzero(self.__written))
+
+    def count(self, value):
+        return int(np.count_nonzero((self.__data == value) & self.__written))
+
+    def bounds(self, nonzero=False):
+        # (min_i, max_i, min_j, max_j) of the written, or only nonzero, cells
+        if not nonzero:
+            return None if self.__bounds is None else tuple(self.__bounds)
+        rows, cols = np.nonzero(self.__data)
+        if not rows.size:
+            return None
+        oi, oj = self.__origin
+        bounds = rows.min() - oi, rows.max() - oi, cols.min() - oj, cols.max() - oj
+        return tuple(map(int, bounds))
+
+    def view(self, bounds=None):
+        bounds = bounds or self.bounds()
+        if bounds is None:
+            return self.__data[:0, :0]
+        i0, i1, j0, j1 = bounds
+        oi, oj = self.__origin
+        return self.__data[i0 + oi : i1 + oi + 1, j0 + oj : j1 + oj + 1]
+
+    def render(self, palette, bounds=None):
+        chars = np.array(list(palette))[self.view(bounds)]
+        return "\n".join("".join(row) for row in chars)
+
+    def to_png(self, levels=None, bounds=None):
+        # 8-bit grayscale PNG, with values mapped through levels if given
+        pixels = self.view(bounds)
+        if levels is not None:
+            pixels = np.asarray(levels, dtype=np.uint8)[pixels]
+        height, width = pixels.shape
+        raw = np.zeros((height, width + 1), dtype=np.uint8)
+        raw[:, 1:] = pixels
+
+        def chunk(kind, body):
+            crc = zlib.crc32(kind + body)
+            return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", crc)
+
+        header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+        return b"".join(
+            (
+                b"\x89PNG\r\n\x1a\n",
+                chunk(b"IHDR", header),
+                chunk(b"IDAT", zlib.compress(raw.tobytes())),
+                chunk(b"IEND", b""),
+            )
+        )
+
+
 def lmap(func, iterable):
     return list(map(func, iterable))
 
@@ -157,6 +272,26 @@ def grid_to_string(grid, func=str, sep=""):
     return "\n".join(map(lambda seq: sep.join(map(func, seq)), grid))
 
 
+def wavefront(passable, start):
+    # distances from start over a boolean grid, advancing the whole frontier
+    # each pass with array shifts; unreachable cells are -1
+    dist = np.full(passable.shape, -1, dtype=np.int64)
+    frontier = np.zeros(passable.shape, dtype=bool)
+    frontier[start] = True
+    dist[start] = 0
+    t = 0
+    while frontier.any():
+        t += 1
+        grown = np.zeros_like(frontier)
+        grown[1:] |= frontier[:-1]
+        grown[:-1] |= frontier[1:]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        frontier = grown & passable & (dist < 0)
+        dist[frontier] = t
+    return dist
+
+
 def dijkstra(
     grid,
     start,